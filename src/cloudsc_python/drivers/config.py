@@ -10,13 +10,10 @@
 # nor does it submit to any jurisdiction.
 
 from __future__ import annotations
-import numpy as np
-from os.path import dirname, join, normpath, splitext
+from os.path import splitext
 from pydantic import BaseModel, validator
 import socket
-from typing import Optional
-
-from cloudsc4py.framework.config import DataTypes, GT4PyConfig
+from typing import Any, Optional
 
 
 class IOConfig(BaseModel):
@@ -54,76 +51,16 @@ class IOConfig(BaseModel):
         args["output_csv_file"] = output_csv_file
         return IOConfig(**args)
 
-
-default_io_config = IOConfig(output_file=None, host_name=None)
-
-
-class PythonConfig(BaseModel):
-    """Gathers options controlling execution of Python/GT4Py code."""
-
-    # domain
-    num_cols: Optional[int]
-
-    # validation
-    enable_validation: bool
-    input_file: str
-    reference_file: str
-
-    # run
-    num_runs: int
-
-    # low-level and/or backend-related
-    data_types: DataTypes
-    gt4py_config: GT4PyConfig
-    sympl_enable_checks: bool
-
-    @validator("gt4py_config")
-    @classmethod
-    def add_dtypes(cls, v, values) -> GT4PyConfig:
-        return v.with_dtypes(values["data_types"])
-
-    def with_backend(self, backend: Optional[str]) -> PythonConfig:
-        args = self.dict()
-        args["gt4py_config"] = GT4PyConfig(**args["gt4py_config"]).with_backend(backend).dict()
-        return PythonConfig(**args)
-
-    def with_checks(self, enabled: bool) -> PythonConfig:
-        args = self.dict()
-        args["gt4py_config"] = (
-            GT4PyConfig(**args["gt4py_config"]).with_validate_args(enabled).dict()
-        )
-        args["sympl_enable_checks"] = enabled
-        return PythonConfig(**args)
-
-    def with_num_cols(self, num_cols: Optional[int]) -> PythonConfig:
-        args = self.dict()
-        if num_cols is not None:
-            args["num_cols"] = num_cols
-        return PythonConfig(**args)
-
-    def with_num_runs(self, num_runs: Optional[int]) -> PythonConfig:
-        args = self.dict()
-        if num_runs is not None:
-            args["num_runs"] = num_runs
-        return PythonConfig(**args)
-
-    def with_validation(self, enabled: bool) -> PythonConfig:
+    def with_updates(self, **kwargs: Any) -> IOConfig:
+        unknown = sorted(set(kwargs) - set(self.__fields__))
+        if unknown:
+            raise TypeError(f"IOConfig has no field(s) {', '.join(unknown)}.")
         args = self.dict()
-        args["enable_validation"] = enabled
-        return PythonConfig(**args)
+        args.update(kwargs)
+        return IOConfig(**args)
 
 
-config_files_dir = normpath(join(dirname(__file__), "../../../config-files"))
-default_python_config = PythonConfig(
-    num_cols=1,
-    enable_validation=True,
-    input_file=join(config_files_dir, "input.h5"),
-    reference_file=join(config_files_dir, "reference.h5"),
-    num_runs=15,
-    data_types=DataTypes(bool=bool, float=np.float64, int=int),
-    gt4py_config=GT4PyConfig(backend="numpy", rebuild=False, validate_args=True, verbose=True),
-    sympl_enable_checks=True,
-)
+default_io_config = IOConfig(output_file=None, host_name=None)
 
 
 class FortranConfig(BaseModel):
@@ -135,6 +72,7 @@ class FortranConfig(BaseModel):
     num_cols: int
     num_runs: int
     num_threads: int
+    num_warmup_runs: int
 
     def with_build_dir(self, build_dir: str) -> FortranConfig:
         args = self.dict()
@@ -161,6 +99,19 @@ class FortranConfig(BaseModel):
         args["num_threads"] = num_threads
         return FortranConfig(**args)
 
+    def with_num_warmup_runs(self, num_warmup_runs: int) -> FortranConfig:
+        args = self.dict()
+        args["num_warmup_runs"] = num_warmup_runs
+        return FortranConfig(**args)
+
+    def with_updates(self, **kwargs: Any) -> FortranConfig:
+        unknown = sorted(set(kwargs) - set(self.__fields__))
+        if unknown:
+            raise TypeError(f"FortranConfig has no field(s) {', '.join(unknown)}.")
+        args = self.dict()
+        args.update(kwargs)
+        return FortranConfig(**args)
+
     def with_variant(self, variant: str) -> FortranConfig:
         args = self.dict()
         args["variant"] = variant
@@ -168,5 +119,11 @@ class FortranConfig(BaseModel):
 
 
 default_fortran_config = FortranConfig(
-    build_dir=".", variant="fortran", nproma=32, num_cols=1, num_runs=1, num_threads=1
+    build_dir=".",
+    variant="fortran",
+    nproma=32,
+    num_cols=1,
+    num_runs=1,
+    num_threads=1,
+    num_warmup_runs=2,
 )
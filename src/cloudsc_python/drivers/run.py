@@ -23,7 +23,8 @@ from cloudsc4py.utils.iox import HDF5Reader
 from cloudsc4py.utils.timing import timing
 from cloudsc4py.utils.validation import validate
 
-from config import PythonConfig, IOConfig, default_python_config, default_io_config
+from config import IOConfig, default_io_config
+from config_python import PythonConfig, default_python_config
 from utils import print_performance, to_csv
 
 
@@ -9,57 +9,146 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
+import asyncio
 import click
+import collections
+import functools
+import numpy as np
 import os
-import subprocess
-from typing import Optional
+import re
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
 from config import FortranConfig, IOConfig, default_fortran_config, default_io_config
 from utils import print_performance, to_csv
 
 
-def core(config: FortranConfig, io_config: IOConfig) -> None:
-    executable = os.path.join(
-        os.path.dirname(__file__), config.build_dir, f"bin/dwarf-cloudsc-{config.variant}"
-    )
+class OutputParser(BaseModel):
+    """Locate the line reporting the overall timing of a run in the output of a dwarf."""
+
+    # bytes pattern whose group `runtime` captures the runtime in milliseconds
+    pattern: Pattern
+
+    def parse(self, line: bytes) -> Optional[float]:
+        """Return the runtime reported by ``line``, or ``None`` if ``line`` is not a match."""
+        # the raw bytes are matched and converted as they are, without decoding
+        if b"TOTAL" not in line:
+            return None
+        match = self.pattern.search(line)
+        return None if match is None else float(match["runtime"])
+
+
+# line printed to stderr by the FORTRAN timer (see `common/module/timer_mod.F90`)
+fortran_parser = OutputParser(
+    pattern=re.compile(
+        rb"^\s*\d+\s+x\s*\d+(?:\s*-?\d+){5}\s+:\s+(?P<runtime>\d+)\s+\d+\s+\d+\s+:\s+TOTAL\s*$"
+    ),
+)
+# line printed to stdout by the C/CUDA drivers (the Loki-generated C variant keeps the FORTRAN
+# driver)
+c_parser = OutputParser(
+    pattern=re.compile(rb"^(?:\s*-?\d+){6}\s+:\s+(?P<runtime>\d+)(?:\s+\d+){1,2}\s+TOTAL\s*$"),
+)
+# variants not listed here are parsed with `fortran_parser`
+parsers = {
+    "c": c_parser,
+    "cuda": c_parser,
+    "cuda-hoist": c_parser,
+    "cuda-k-caching": c_parser,
+}
+
+# shell script running a command a given number of times, and stopping at the first failure
+REPEAT_SCRIPT = 'n=$1; shift; for _ in $(seq "$n"); do "$@" || exit $?; done'
+
+
+drivers_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def get_executable(build_dir: str, variant: str) -> str:
+    """Return the path to the executable of ``variant``, checking that it exists."""
+    executable = os.path.join(drivers_dir, build_dir, "bin", f"dwarf-cloudsc-{variant}")
     if not os.path.exists(executable):
         raise RuntimeError(f"The executable `{executable}` does not exist.")
+    return executable
 
-    # warm-up cache
-    _ = subprocess.run(
-        [
-            executable,
-            str(config.num_threads),
-            str(config.num_cols),
-            str(min(config.num_cols, config.nproma)),
-        ],
-        capture_output=True,
+
+async def run_repeatedly(
+    args: List[str], num_runs: int, parser: OutputParser, env: Optional[Dict[str, str]] = None
+) -> np.ndarray:
+    """Execute the dwarf ``num_runs`` times and return the measured runtimes.
+
+    The executions are chained within a single shell, so that the dwarf is spawned back-to-back
+    without returning to the Python interpreter in between. A failing execution stops the chain
+    and raises a ``RuntimeError`` carrying the last lines of output.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "sh",
+        "-c",
+        REPEAT_SCRIPT,
+        "sh",
+        str(num_runs),
+        *args,
+        # stderr is merged into stdout, so that the reported errors include the diagnostics of
+        # both streams; the parsers only match the timing line
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        env=env,
     )
+    runtimes = np.empty(num_runs, dtype=np.float64)
+    num_records = 0
+    # the last lines are retained to report errors
+    tail = collections.deque(maxlen=10)
+    async for line in proc.stdout:
+        tail.append(line)
+        runtime = parser.parse(line)
+        if runtime is not None:
+            if num_records < num_runs:
+                runtimes[num_records] = runtime
+            num_records += 1
+    if await proc.wait():
+        raise RuntimeError(
+            f"`{args[0]}` failed with exit code {proc.returncode}. "
+            "Last lines of output:\n" + b"".join(tail).decode("utf-8", errors="replace")
+        )
+    if num_records != num_runs:
+        raise RuntimeError(
+            f"Expected {num_runs} performance records in the output of `{args[0]}`, "
+            f"but found {num_records}."
+        )
+
+    return runtimes
+
+
+async def core_async(
+    config: FortranConfig,
+    io_config: IOConfig,
+    env: Optional[Dict[str, str]] = None,
+    label: Optional[str] = None,
+) -> Tuple[float, float]:
+    """Run and profile the dwarf without blocking the event loop.
+
+    ``env`` is the environment of the dwarf, if other than the one of the current process.
+    ``label`` identifies the run in the printed performance summary.
+    """
+    executable = get_executable(config.build_dir, config.variant)
+    args = [
+        executable,
+        str(config.num_threads),
+        str(config.num_cols),
+        str(min(config.num_cols, config.nproma)),
+    ]
+    parser = parsers.get(config.variant, fortran_parser)
+
+    # warm-up cache
+    # failures are not tolerated here either, so that a broken setup is not profiled
+    if config.num_warmup_runs > 0:
+        await run_repeatedly(args, config.num_warmup_runs, parser, env)
 
     # run and profile
-    runtimes = []
-    for _ in range(config.num_runs):
-        out = subprocess.run(
-            [
-                executable,
-                str(config.num_threads),
-                str(config.num_cols),
-                str(min(config.num_cols, config.nproma)),
-            ],
-            capture_output=True,
-        )
-        if "gpu" in config.variant:
-            x = out.stderr.decode("utf-8").split("\n")[2]
-            y = x.split(" ")
-            z = [c for c in y if c != ""]
-            runtimes.append(float(z[-4]))
-        else:
-            x = out.stderr.decode("utf-8").split("\n")[-2]
-            y = x.split(" ")
-            z = [c for c in y if c != ""]
-            runtimes.append(float(z[-4]))
-
-    runtime_mean, runtime_stddev = print_performance(runtimes)
+    runtimes = await run_repeatedly(args, config.num_runs, parser, env)
+
+    runtime_mean, runtime_stddev = print_performance(runtimes, label)
 
     if io_config.output_csv_file is not None:
         to_csv(
@@ -72,6 +161,12 @@ def core(config: FortranConfig, io_config: IOConfig) -> None:
             runtime_stddev,
         )
 
+    return runtime_mean, runtime_stddev
+
+
+def core(config: FortranConfig, io_config: IOConfig) -> Tuple[float, float]:
+    return asyncio.run(core_async(config, io_config))
+
 
 @click.command()
 @click.option(
@@ -85,7 +180,8 @@ def core(config: FortranConfig, io_config: IOConfig) -> None:
     type=str,
     default="fortran",
     help="Code variant."
-    "\n\nOptions: fortran, gpu-scc, gpu-scc-hoist, gpu-omp-scc-hoist."
+    "\n\nOptions: fortran, gpu-scc, gpu-scc-hoist, gpu-omp-scc-hoist, c, cuda, cuda-hoist, "
+    "cuda-k-caching."
     "\n\nDefault: fortran.",
 )
 @click.option(
@@ -101,6 +197,13 @@ def core(config: FortranConfig, io_config: IOConfig) -> None:
     default=1,
     help="Number of executions.\n\nDefault: 1.",
 )
+@click.option(
+    "--num-warmup-runs",
+    type=int,
+    default=2,
+    help="Number of executions preceding the timed ones, to warm up caches and devices."
+    "\n\nDefault: 2.",
+)
 @click.option(
     "--num-threads",
     type=int,
@@ -116,26 +219,14 @@ def core(config: FortranConfig, io_config: IOConfig) -> None:
     default=None,
     help="Path to the CSV file where writing performance counters (optional).",
 )
-def main(
-    build_dir: str,
-    variant: str,
-    nproma: int,
-    num_cols: int,
-    num_runs: int,
-    num_threads: int,
-    host_alias: Optional[str],
-    output_csv_file: Optional[str],
-) -> None:
+def main(host_alias: Optional[str], output_csv_file: Optional[str], **kwargs: Any) -> None:
     """Driver for the FORTRAN implementation of CLOUDSC."""
-    config = (
-        default_fortran_config.with_build_dir(build_dir)
-        .with_variant(variant)
-        .with_nproma(nproma)
-        .with_num_cols(num_cols)
-        .with_num_runs(num_runs)
-        .with_num_threads(num_threads)
+    # the remaining options are named after the fields of FortranConfig, and with_updates raises
+    # if an option has no matching field
+    config = default_fortran_config.with_updates(**kwargs)
+    io_config = default_io_config.with_updates(
+        output_csv_file=output_csv_file, host_name=host_alias
     )
-    io_config = default_io_config.with_output_csv_file(output_csv_file).with_host_name(host_alias)
     core(config, io_config)
 
 
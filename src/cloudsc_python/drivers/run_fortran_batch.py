@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2018- ECMWF.
+# (C) Copyright 2022- ETH Zurich.
+
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+from __future__ import annotations
+import asyncio
+import click
+import contextlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from config import default_fortran_config, default_io_config
+from run_fortran import core_async
+from utils import to_csv
+
+if TYPE_CHECKING:
+    from typing import List, Optional, Tuple
+
+    from config import FortranConfig
+
+
+async def run_jobs(
+    jobs: List[FortranConfig], device_ids: List[str], visible_devices_var: str
+) -> List[Optional[Tuple[float, float]]]:
+    """Run the jobs concurrently, with at most one job per device at any time.
+
+    Each job only sees its device through the environment variable ``visible_devices_var``.
+    """
+    devices = asyncio.Queue()
+    for device_id in device_ids:
+        devices.put_nowait(device_id)
+
+    async def run_job(config: FortranConfig) -> Optional[Tuple[float, float]]:
+        device_id = await devices.get()
+        env = None
+        if len(device_ids) > 1:
+            env = {**os.environ, visible_devices_var: device_id}
+        # results are printed in completion order, so each of them names its job
+        label = f"{config.variant} ({config.build_dir}, num_cols={config.num_cols})"
+        try:
+            return await core_async(config, default_io_config, env=env, label=label)
+        except RuntimeError as e:
+            print(f"{label}: {e}")
+            return None
+        finally:
+            devices.put_nowait(device_id)
+
+    return await asyncio.gather(*(run_job(config) for config in jobs))
+
+
+@click.command()
+@click.option(
+    "--build-dir",
+    "build_dirs",
+    type=str,
+    multiple=True,
+    required=True,
+    help="Path to the build directory of the FORTRAN dwarf. Can be given multiple times.",
+)
+@click.option(
+    "--variant",
+    "variants",
+    type=str,
+    multiple=True,
+    required=True,
+    help="Code variant. Can be given multiple times."
+    "\n\nOptions: fortran, gpu-scc, gpu-scc-hoist, gpu-omp-scc-hoist, c, cuda, cuda-hoist, "
+    "cuda-k-caching.",
+)
+@click.option(
+    "--nproma",
+    "nproma_l",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Block size, one value per variant.\n\nRecommended values: 32 on CPUs, 128 on GPUs.",
+)
+@click.option(
+    "--num-threads",
+    "num_threads_l",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Number of threads, one value per variant."
+    "\n\nRecommended values: 24 on Piz Daint's CPUs, 128 on MLux's CPUs, 1 on GPUs.",
+)
+@click.option(
+    "--num-cols",
+    "num_cols_l",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Number of domain columns. Can be given multiple times.",
+)
+@click.option(
+    "--num-runs",
+    type=int,
+    default=1,
+    help="Number of executions.\n\nDefault: 1.",
+)
+@click.option(
+    "--num-warmup-runs",
+    type=int,
+    default=2,
+    help="Number of executions preceding the timed ones, to warm up caches and devices."
+    "\n\nDefault: 2.",
+)
+@click.option(
+    "--num-devices",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of GPUs the runs are distributed over. Runs assigned to distinct GPUs "
+    "execute concurrently, so keep the default when benchmarking CPU variants.\n\nDefault: 1.",
+)
+@click.option(
+    "--visible-devices-var",
+    type=click.Choice(["CUDA_VISIBLE_DEVICES", "ROCR_VISIBLE_DEVICES", "HIP_VISIBLE_DEVICES"]),
+    default="CUDA_VISIBLE_DEVICES",
+    help="Environment variable restricting each run to its GPU. If already set, e.g. by the "
+    "job scheduler, the runs are distributed over the devices it lists."
+    "\n\nRecommended values: CUDA_VISIBLE_DEVICES on NVIDIA GPUs, ROCR_VISIBLE_DEVICES on AMD GPUs."
+    "\n\nDefault: CUDA_VISIBLE_DEVICES.",
+)
+@click.option("--host-alias", type=str, default=None, help="Name of the host machine (optional).")
+@click.option(
+    "--output-dir",
+    type=str,
+    default=None,
+    help="Path to the directory where writing performance counters (optional). The counters for "
+    "each build directory are stored in `<output-dir>/<build-dir>/performance.csv`, where "
+    "`<build-dir>` is taken relative to the common parent of all build directories.",
+)
+def main(
+    build_dirs: Tuple[str, ...],
+    variants: Tuple[str, ...],
+    nproma_l: Tuple[int, ...],
+    num_threads_l: Tuple[int, ...],
+    num_cols_l: Tuple[int, ...],
+    num_runs: int,
+    num_warmup_runs: int,
+    num_devices: int,
+    visible_devices_var: str,
+    host_alias: Optional[str],
+    output_dir: Optional[str],
+) -> None:
+    """Driver running the FORTRAN implementation of CLOUDSC under different settings."""
+    if not len(variants) == len(nproma_l) == len(num_threads_l):
+        raise click.BadParameter(
+            "`--variant`, `--nproma` and `--num-threads` must be given the same number of times."
+        )
+
+    # the devices are picked among those made visible to this process, if any
+    visible_devices = os.environ.get(visible_devices_var)
+    if visible_devices:
+        device_ids = visible_devices.split(",")
+        if num_devices > len(device_ids):
+            raise click.BadParameter(
+                f"`--num-devices` exceeds the {len(device_ids)} device(s) listed in "
+                f"`{visible_devices_var}`."
+            )
+        device_ids = device_ids[:num_devices]
+    else:
+        device_ids = [str(device_id) for device_id in range(num_devices)]
+
+    # the configurations share the settings of the outer loops
+    jobs = []
+    io_configs = {}
+    if output_dir is not None:
+        # the counters of each build directory go to its path relative to the common parent of all
+        # build directories, so that e.g. `release/double` and `debug/double` do not share a file
+        output_root = Path(output_dir)
+        build_paths = {build_dir: Path(build_dir).resolve() for build_dir in build_dirs}
+        common_parent = Path(os.path.commonpath([path.parent for path in build_paths.values()]))
+    for build_dir in build_dirs:
+        if output_dir is not None:
+            env_output_dir = output_root / build_paths[build_dir].relative_to(common_parent)
+            env_output_dir.mkdir(parents=True, exist_ok=True)
+            io_configs[build_dir] = default_io_config.with_updates(
+                output_csv_file=str(env_output_dir / "performance.csv"), host_name=host_alias
+            )
+
+        build_config = default_fortran_config.with_updates(
+            build_dir=build_dir, num_runs=num_runs, num_warmup_runs=num_warmup_runs
+        )
+        for variant, nproma, num_threads in zip(variants, nproma_l, num_threads_l):
+            variant_config = build_config.with_updates(
+                variant=variant, nproma=nproma, num_threads=num_threads
+            )
+            jobs.extend(variant_config.with_num_cols(num_cols) for num_cols in num_cols_l)
+
+    # the jobs are launched as subprocesses of a single event loop, and each of them is pinned to
+    # the first device left free by the previous jobs
+    results = asyncio.run(run_jobs(jobs, device_ids, visible_devices_var))
+
+    # the performance counters are written by this process only, so that concurrent jobs do not
+    # interleave their rows; each file is opened once and the rows are buffered
+    if output_dir is not None:
+        with contextlib.ExitStack() as stack:
+            csv_files = {}
+            for config, result in zip(jobs, results):
+                if result is None:
+                    continue
+                io_config = io_configs[config.build_dir]
+                if io_config.output_csv_file not in csv_files:
+                    csv_files[io_config.output_csv_file] = stack.enter_context(
+                        open(io_config.output_csv_file, "a", buffering=65536, newline="")
+                    )
+                to_csv(
+                    csv_files[io_config.output_csv_file],
+                    io_config.host_name,
+                    config.variant,
+                    config.num_cols,
+                    config.num_runs,
+                    *result,
+                )
+
+
+if __name__ == "__main__":
+    main()
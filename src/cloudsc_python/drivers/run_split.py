@@ -17,7 +17,8 @@ from typing import Optional
 
 from cloudsc4py.physics.cloudsc_split import Cloudsc
 
-from config import default_python_config, default_io_config
+from config import default_io_config
+from config_python import default_python_config
 from run import core
 
 
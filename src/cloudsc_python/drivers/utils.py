@@ -12,15 +12,16 @@
 from __future__ import annotations
 import csv
 import datetime
-import os
+import numpy as np
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Tuple
+    from numpy.typing import ArrayLike
+    from typing import Optional, TextIO, Tuple, Union
 
 
 def to_csv(
-    output_file: str,
+    output_file: Union[str, TextIO],
     host_name: str,
     variant: str,
     num_cols: int,
@@ -28,30 +29,41 @@ def to_csv(
     runtime_mean: float,
     runtime_stddev: float,
 ) -> None:
-    """Write mean and standard deviation of measured runtimes to a CSV file."""
-    if not os.path.exists(output_file):
-        with open(output_file, "w") as csv_file:
-            writer = csv.writer(csv_file, delimiter=",")
-            writer.writerow(("date", "host", "variant", "num_cols", "num_runs", "mean", "stddev"))
-    with open(output_file, "a") as csv_file:
-        writer = csv.writer(csv_file, delimiter=",")
-        writer.writerow(
-            (
-                datetime.date.today().strftime("%Y%m%d"),
-                host_name,
-                variant,
-                num_cols,
-                num_runs,
-                runtime_mean,
-                runtime_stddev,
-            )
+    """Write mean and standard deviation of measured runtimes to a CSV file.
+
+    ``output_file`` is either the path to the file, or a handle to it opened in append mode. The
+    latter lets a driver writing many rows keep the file open and buffer the writes.
+    """
+    if isinstance(output_file, str):
+        with open(output_file, "a", newline="") as csv_file:
+            to_csv(csv_file, host_name, variant, num_cols, num_runs, runtime_mean, runtime_stddev)
+        return
+
+    writer = csv.writer(output_file, delimiter=",")
+    if output_file.tell() == 0:
+        writer.writerow(("date", "host", "variant", "num_cols", "num_runs", "mean", "stddev"))
+    writer.writerow(
+        (
+            datetime.date.today().strftime("%Y%m%d"),
+            host_name,
+            variant,
+            num_cols,
+            num_runs,
+            runtime_mean,
+            runtime_stddev,
         )
+    )
+
 
+def print_performance(runtimes: ArrayLike, label: Optional[str] = None) -> Tuple[float, float]:
+    """Print means and standard deviation of measure runtimes to screen.
 
-def print_performance(runtimes: list[float]) -> Tuple[float, float]:
-    """Print means and standard deviation of measure runtimes to screen."""
-    n = len(runtimes)
-    mean = sum(runtimes) / n
-    stddev = (sum((runtime - mean) ** 2 for runtime in runtimes) / (n - 1 if n > 1 else n)) ** 0.5
-    print(f"Performance: Average runtime over {n} runs: {mean:.3f} \u00B1 {stddev:.3f} ms.")
+    ``label`` prefixes the printed line, to tell apart the results of concurrent runs.
+    """
+    runtimes = np.asarray(runtimes, dtype=np.float64)
+    n = runtimes.size
+    mean = float(runtimes.mean())
+    stddev = float(runtimes.std(ddof=1 if n > 1 else 0))
+    prefix = "" if label is None else f"{label}: "
+    print(f"{prefix}Performance: Average runtime over {n} runs: {mean:.3f} \u00B1 {stddev:.3f} ms.")
     return mean, stddev
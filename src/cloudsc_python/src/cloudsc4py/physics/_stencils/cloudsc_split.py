@@ -22,7 +22,6 @@ from cloudsc4py.physics._stencils.fcttre import (
     f_foedem,
     f_foeeice,
     f_foeeliq,
-    f_foeewm,
     f_foeldcpm,
 )
 from cloudsc4py.physics._stencils.helpers import f_helper_0, f_helper_1
@@ -329,20 +328,25 @@ def cloudsc_tendencies(
             qs = 0.0
 
         # --- define saturation values
+        # --- saturation vapour pressure over liquid water and ice, shared by all the expressions
+        # --- below so that each exponential is evaluated only once
+        foeeliq = f_foeeliq(t)
+        foeeice = f_foeeice(t)
+
         # --- old *diagnostic* mixed phase saturation
         foealfa = f_foealfa(t)
         out_foealfa[0, 0, 0] = foealfa
-        foeewmt = min(f_foeewm(t) / in_ap[0, 0, 0], 0.5)
+        foeewmt = min((foealfa * foeeliq + (1 - foealfa) * foeeice) / in_ap[0, 0, 0], 0.5)
         qsmix = foeewmt / (1 - RETV * foeewmt)
 
         # --- ice saturation T < 273K
         # --- liquid water saturation for T > 273K
         alfa = f_foedelta(t)
-        foeew = min((alfa * f_foeeliq(t) + (1 - alfa) * f_foeeice(t)) / in_ap[0, 0, 0], 0.5)
+        foeew = min((alfa * foeeliq + (1 - alfa) * foeeice) / in_ap[0, 0, 0], 0.5)
         qsice = foeew / (1 - RETV * foeew)
 
         # --- liquid water saturation
-        foeeliqt = min(f_foeeliq(t) / in_ap[0, 0, 0], 0.5)
+        foeeliqt = min(foeeliq / in_ap[0, 0, 0], 0.5)
         qsliq = foeeliqt / (1 - RETV * foeeliqt)
 
         # --- ensure cloud fraction is between 0 and 1
@@ -12,7 +12,6 @@
 from gt4py import gtscript
 
 from cloudsc4py.framework.stencil import function_collection
-from cloudsc4py.physics._stencils.fcttre import f_foeeice, f_foeeliq
 from cloudsc4py.utils.f2py import ported_function
 
 
@@ -20,6 +19,9 @@ from cloudsc4py.utils.f2py import ported_function
 @function_collection("f_fokoop")
 @gtscript.function
 def f_fokoop(t):
-    from __externals__ import RKOOP1, RKOOP2
+    from __externals__ import R3IES, R3LES, R4IES, R4LES, RKOOP1, RKOOP2, RTT
 
-    return min(RKOOP1 - RKOOP2 * t, f_foeeliq(t) / f_foeeice(t))
+    # the ratio f_foeeliq(t) / f_foeeice(t) is evaluated as a single exponential
+    return min(
+        RKOOP1 - RKOOP2 * t, exp(R3LES * (t - RTT) / (t - R4LES) - R3IES * (t - RTT) / (t - R4IES))
+    )